@@ -4,20 +4,27 @@ Coordinateur pour distribuer le solveur de puzzle Bitcoin sur plusieurs instance
 """
 
 import asyncio
+import collections
 import json
 import logging
 import os
+import re
+import shlex
 import subprocess
 import sys
 import time
-from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, asdict
-from datetime import datetime
-from typing import List, Dict, Optional
-import paramiko
+from datetime import datetime, timedelta
+from typing import Deque, List, Dict, Optional
+import asyncssh
 import threading
 import queue
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration du logging
 logging.basicConfig(
     level=logging.INFO,
@@ -29,7 +36,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
-@dataclass
+# Cache local des APIs déjà activées par projet
+CACHE_FILE = '.coordinator_cache.json'
+CACHE_TTL = timedelta(hours=24)
+
+# Ligne de statistiques du solveur : "... Total: <clés> ... Vitesse: <clés/s> ..."
+STATS_RE = re.compile(r"Total:\s*(\d+).*?Vitesse:\s*([\d.]+)")
+
+# Plages attribuées à chaque instance, conservées d'une exécution à l'autre
+RANGES_FILE = 'ranges.json'
+
+@dataclass(slots=True)
 class CloudShellInstance:
     """Représente une instance Cloud Shell"""
     name: str
@@ -37,22 +54,28 @@ class CloudShellInstance:
     zone: str
     username: str
     status: str = "inactive"
-    ssh_client: Optional[paramiko.SSHClient] = None
+    ssh_client: Optional[asyncssh.SSHClientConnection] = None
+    stats_process: Optional[asyncssh.SSHClientProcess] = None
+    stats_task: Optional[asyncio.Task] = None
     process_id: Optional[str] = None
     start_range: str = ""
     end_range: str = ""
     keys_per_second: float = 0.0
     total_keys_checked: int = 0
     last_update: datetime = None
-    errors: List[str] = None
+    errors: Deque[str] = None
+    inbox: Deque[str] = None
 
     def __post_init__(self):
-        if self.errors is None:
-            self.errors = []
+        # Historique borné : seules les 50 dernières erreurs sont conservées
+        self.errors = collections.deque(self.errors or (), maxlen=50)
+        # File propre à l'instance : un seul producteur (le flux de stats), un seul consommateur
+        if self.inbox is None:
+            self.inbox = collections.deque(maxlen=1024)
         if self.last_update is None:
             self.last_update = datetime.now()
 
-@dataclass
+@dataclass(slots=True)
 class CoordinatorConfig:
     """Configuration du coordinateur"""
     binary_name: str = "bitcoin_puzzle_solver"
@@ -71,30 +94,84 @@ class CoordinatorConfig:
 class RangeManager:
     """Gestionnaire des plages de recherche"""
     
-    def __init__(self, total_start: str, total_end: str):
+    def __init__(self, total_start: str, total_end: str, state_file: str = RANGES_FILE):
         self.total_start = int(total_start, 16 if total_start.startswith('0x') else 10)
         self.total_end = int(total_end, 16 if total_end.startswith('0x') else 10)
+        self.state_file = state_file
+        # Plages attribuées lors de l'exécution précédente, pour détecter les changements
+        self.saved_ranges: Dict[str, tuple] = self._load_ranges()
+        self.instance_indexes: Dict[str, int] = {}
         self.assigned_ranges = {}
         self.completed_ranges = set()
         self.lock = threading.Lock()
+        # Découpage précalculé : bornes entières et leur forme hexadécimale
+        self.partition: List[tuple] = []
+        self.partition_hex: List[tuple] = []
+    
+    def _load_ranges(self) -> Dict[str, tuple]:
+        """Recharge les plages attribuées lors de l'exécution précédente"""
+        try:
+            with open(self.state_file, 'r') as f:
+                return {name: tuple(bounds) for name, bounds in json.load(f).items()}
+        except (FileNotFoundError, json.JSONDecodeError, AttributeError, TypeError):
+            return {}
+    
+    def _save_ranges(self):
+        """Persiste les plages attribuées aux instances actuelles"""
+        try:
+            with open(self.state_file, 'w') as f:
+                json.dump({name: [hex(start), hex(end)] for name, (start, end) in self.assigned_ranges.items()},
+                          f, indent=2)
+        except OSError as e:
+            logger.warning(f"Impossible d'écrire {self.state_file}: {e}")
+    
+    def register_instance(self, instance_name: str) -> int:
+        """Attribue à une instance son index dans l'ordre trié des instances actuelles"""
+        with self.lock:
+            if instance_name not in self.instance_indexes:
+                names = sorted([*self.instance_indexes, instance_name])
+                self.instance_indexes = {name: index for index, name in enumerate(names)}
+            return self.instance_indexes[instance_name]
+    
+    def build_partition(self, num_slices: int):
+        """Calcule une fois les bornes de chaque tranche de la plage totale"""
+        range_size = (self.total_end - self.total_start) // num_slices
+        partition = []
+        for index in range(num_slices):
+            start = self.total_start + (index * range_size)
+            end = self.total_end if index == num_slices - 1 else start + range_size - 1
+            partition.append((start, end))
+        
+        self.partition_hex = [(hex(start), hex(end)) for start, end in partition]
+        self.partition = partition
+        self._report_saved_ranges()
+    
+    def _report_saved_ranges(self):
+        """Signale les plages de l'exécution précédente qui ne seront pas reprises"""
+        for name in sorted(self.saved_ranges.keys() - self.instance_indexes.keys()):
+            logger.warning(f"{self.state_file}: instance {name} absente de la configuration, "
+                           f"sa plage {self.saved_ranges[name][0]} - {self.saved_ranges[name][1]} n'est plus attribuée")
+        
+        for name, index in self.instance_indexes.items():
+            saved = self.saved_ranges.get(name)
+            if saved is not None and saved != self.partition_hex[index]:
+                logger.warning(f"{self.state_file}: la plage de {name} change "
+                               f"({saved[0]} - {saved[1]} -> {self.partition_hex[index][0]} - {self.partition_hex[index][1]})")
     
-    def get_range_for_instance(self, instance_name: str, num_instances: int) -> tuple:
+    def get_range_for_instance(self, instance_name: str) -> tuple:
         """Attribue une plage de recherche à une instance"""
+        self.register_instance(instance_name)
+        
         with self.lock:
-            total_range = self.total_end - self.total_start
-            range_size = total_range // num_instances
-            
-            # Calculer l'index de l'instance
-            instance_hash = hash(instance_name) % num_instances
-            
-            start = self.total_start + (instance_hash * range_size)
-            end = start + range_size - 1
-            
-            if instance_hash == num_instances - 1:
-                end = self.total_end
+            # Une tranche par instance actuelle : aucune tranche n'est laissée sans instance
+            num_slices = len(self.instance_indexes)
+            if len(self.partition) != num_slices:
+                self.build_partition(num_slices)
+            index = self.instance_indexes[instance_name]
             
-            self.assigned_ranges[instance_name] = (start, end)
-            return (hex(start), hex(end))
+            self.assigned_ranges[instance_name] = self.partition[index]
+            self._save_ranges()
+            return self.partition_hex[index]
     
     def mark_range_completed(self, instance_name: str):
         """Marque une plage comme terminée"""
@@ -102,6 +179,77 @@ class RangeManager:
             if instance_name in self.assigned_ranges:
                 self.completed_ranges.add(self.assigned_ranges[instance_name])
 
+def load_cache(filename: str = CACHE_FILE) -> Dict:
+    """Charge le cache local du coordinateur"""
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return {}
+
+def save_cache(cache: Dict, filename: str = CACHE_FILE):
+    """Sauvegarde le cache local du coordinateur"""
+    try:
+        with open(filename, 'w') as f:
+            json.dump(cache, f, indent=2)
+    except OSError as e:
+        logger.warning(f"Impossible d'écrire le cache {filename}: {e}")
+
+def drain_queue(q: queue.Queue) -> List:
+    """Récupère en une passe tous les éléments disponibles d'une file"""
+    items = []
+    try:
+        while True:
+            items.append(q.get_nowait())
+    except queue.Empty:
+        pass
+    return items
+
+async def run_command(cmd: List[str], timeout: Optional[float] = None) -> subprocess.CompletedProcess:
+    """Exécute une commande locale sans bloquer la boucle asyncio"""
+    process = await asyncio.create_subprocess_exec(
+        *cmd,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.PIPE
+    )
+    try:
+        stdout, stderr = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        process.kill()
+        await process.wait()
+        raise
+    
+    return subprocess.CompletedProcess(
+        cmd, process.returncode,
+        stdout.decode(errors='replace'), stderr.decode(errors='replace')
+    )
+
+def parse_ssh_command(command_line: str) -> Optional[tuple]:
+    """Extrait (utilisateur, hôte, port, clé) de la commande ssh affichée par gcloud --dry-run"""
+    args = shlex.split(command_line.strip())
+    port = 22
+    identity_file = None
+    target = None
+    
+    i = 1
+    while i < len(args) and args[i] != '--':
+        if args[i] in ('-p', '-i', '-o') and i + 1 < len(args):
+            if args[i] == '-p':
+                port = int(args[i + 1])
+            elif args[i] == '-i':
+                identity_file = args[i + 1]
+            i += 2
+            continue
+        if not args[i].startswith('-'):
+            target = args[i]
+        i += 1
+    
+    if not target or '@' not in target:
+        return None
+    
+    username, host = target.split('@', 1)
+    return (username, host, port, identity_file)
+
 class CloudShellCoordinator:
     """Coordinateur principal pour gérer les instances Cloud Shell"""
     
@@ -110,7 +258,13 @@ class CloudShellCoordinator:
         self.instances: Dict[str, CloudShellInstance] = {}
         self.range_manager = RangeManager(config.total_start_range, config.total_end_range)
         self.status_queue = queue.Queue()
-        self.executor = ThreadPoolExecutor(max_workers=20)
+        # Totaux des instances actives, tenus à jour au fil des changements
+        self._agg = {"speed": 0.0, "keys": 0, "active": 0}
+        self._errors_ring = collections.deque(maxlen=5)
+        self.cache = load_cache()
+        # Échéances (time.monotonic) des tâches périodiques, fixées au démarrage
+        self._next_restart_at = 0.0
+        self._next_rebalance_at = 0.0
         self.running = False
         
     def add_instance(self, name: str, project_id: str, zone: str = "us-central1-a", username: str = None):
@@ -126,17 +280,67 @@ class CloudShellCoordinator:
         )
         
         self.instances[name] = instance
+        self.range_manager.register_instance(name)
         logger.info(f"Instance ajoutée: {name} (projet: {project_id})")
         
+    def set_instance_status(self, instance: CloudShellInstance, status: str):
+        """Met à jour le statut d'une instance et publie la transition"""
+        if instance.status != status:
+            self.status_queue.put((instance.name, f"{instance.status} -> {status}"))
+            if instance.status == "running" or status == "running":
+                sign = 1 if status == "running" else -1
+                self._agg["speed"] += sign * instance.keys_per_second
+                self._agg["keys"] += sign * instance.total_keys_checked
+                self._agg["active"] += sign
+            instance.status = status
+    
+    def record_error(self, instance: CloudShellInstance, message: str):
+        """Enregistre une erreur sur l'instance et dans les erreurs récentes"""
+        instance.errors.append(message)
+        self._errors_ring.append(message)
+    
+    def process_status_updates(self):
+        """Traite d'un bloc les transitions accumulées depuis le dernier tick"""
+        updates = drain_queue(self.status_queue)
+        if updates:
+            logger.info("Changements d'état: " + ", ".join(f"{name} {change}" for name, change in updates))
+        
+        for instance in self.instances.values():
+            # Chaque ligne porte des totaux cumulés : seule la plus récente compte
+            if instance.inbox:
+                latest = instance.inbox.pop()
+                instance.inbox.clear()
+                self.parse_statistics(instance, latest)
+    
+    def is_cloudshell_enabled(self, project_id: str) -> bool:
+        """Indique si l'API Cloud Shell a été activée récemment pour ce projet"""
+        enabled_at = self.cache.get(project_id, {}).get("cloudshell_enabled_at")
+        if not enabled_at:
+            return False
+        try:
+            return datetime.now() - datetime.fromisoformat(enabled_at) < CACHE_TTL
+        except ValueError:
+            return False
+    
+    def invalidate_project_cache(self, project_id: str, error_output: str):
+        """Oublie l'activation mise en cache si gcloud signale un problème de droits ou d'état"""
+        if "PERMISSION_DENIED" in error_output or "FAILED_PRECONDITION" in error_output:
+            if self.cache.pop(project_id, None) is not None:
+                save_cache(self.cache)
+    
     def create_cloud_shell_instance(self, project_id: str, instance_name: str) -> bool:
         """Crée une nouvelle instance Cloud Shell via gcloud"""
         try:
             # Activer Cloud Shell API si nécessaire
-            cmd_enable = [
-                "gcloud", "services", "enable", "cloudshell.googleapis.com",
-                "--project", project_id
-            ]
-            subprocess.run(cmd_enable, check=True, capture_output=True)
+            if not self.is_cloudshell_enabled(project_id):
+                cmd_enable = [
+                    "gcloud", "services", "enable", "cloudshell.googleapis.com",
+                    "--project", project_id
+                ]
+                subprocess.run(cmd_enable, check=True, capture_output=True, text=True)
+                
+                self.cache.setdefault(project_id, {})["cloudshell_enabled_at"] = datetime.now().isoformat()
+                save_cache(self.cache)
             
             # Créer l'environnement Cloud Shell
             cmd_create = [
@@ -150,58 +354,108 @@ class CloudShellCoordinator:
                 return True
             else:
                 logger.error(f"Erreur création instance {instance_name}: {result.stderr}")
+                self.invalidate_project_cache(project_id, result.stderr)
                 return False
                 
+        except subprocess.CalledProcessError as e:
+            logger.error(f"Erreur activation Cloud Shell pour {instance_name}: {e.stderr}")
+            self.invalidate_project_cache(project_id, e.stderr or "")
+            return False
         except Exception as e:
             logger.error(f"Erreur lors de la création de l'instance {instance_name}: {e}")
             return False
     
-    def connect_to_instance(self, instance: CloudShellInstance) -> bool:
-        """Se connecte à une instance Cloud Shell via SSH"""
+    async def connect_to_instance(self, instance: CloudShellInstance) -> bool:
+        """Ouvre une connexion SSH persistante vers une instance Cloud Shell"""
         try:
-            # Utiliser gcloud pour obtenir les informations de connexion
+            if instance.ssh_client is not None and not instance.ssh_client.is_closed():
+                await self.start_stats_stream(instance)
+                self.set_instance_status(instance, "connected")
+                return True
+            
+            # Utiliser gcloud une seule fois pour obtenir les informations de connexion
             cmd = [
                 "gcloud", "cloud-shell", "ssh",
                 "--project", instance.project_id,
-                "--command", "echo 'Connection test'"
+                "--authorize-session",
+                "--dry-run"
             ]
             
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+            result = await run_command(cmd, timeout=30)
             
-            if result.returncode == 0:
-                instance.status = "connected"
-                logger.info(f"Connexion établie avec {instance.name}")
-                return True
-            else:
+            if result.returncode != 0:
                 logger.error(f"Échec connexion {instance.name}: {result.stderr}")
                 return False
+            
+            ssh_target = parse_ssh_command(result.stdout)
+            if ssh_target is None:
+                logger.error(f"Commande SSH introuvable pour {instance.name}: {result.stdout}")
+                return False
+            
+            username, host, port, identity_file = ssh_target
+            instance.ssh_client = await asyncio.wait_for(
+                asyncssh.connect(
+                    host,
+                    port=port,
+                    username=username,
+                    client_keys=[identity_file] if identity_file else (),
+                    known_hosts=None,
+                    keepalive_interval=30,
+                    keepalive_count_max=3
+                ),
+                timeout=30
+            )
+            
+            await self.start_stats_stream(instance)
+            self.set_instance_status(instance, "connected")
+            logger.info(f"Connexion établie avec {instance.name}")
+            return True
                 
         except Exception as e:
             logger.error(f"Erreur connexion {instance.name}: {e}")
-            instance.errors.append(f"Connexion error: {str(e)}")
+            self.record_error(instance, f"Connexion error: {str(e)}")
             return False
     
-    def upload_files_to_instance(self, instance: CloudShellInstance) -> bool:
+    async def start_stats_stream(self, instance: CloudShellInstance):
+        """Ouvre un canal persistant qui suit les statistiques du solveur"""
+        if instance.stats_task is not None and not instance.stats_task.done():
+            return
+        
+        instance.stats_process = await instance.ssh_client.create_process(
+            "tail -n 5 -F ~/solver.log 2>/dev/null | grep --line-buffered Stats"
+        )
+        instance.stats_task = asyncio.create_task(self._read_stats(instance))
+    
+    async def _read_stats(self, instance: CloudShellInstance):
+        """Dépose les lignes de statistiques dans la file de l'instance au fil de leur arrivée"""
+        try:
+            async for line in instance.stats_process.stdout:
+                instance.inbox.append(line)
+                instance.last_update = datetime.now()
+        except Exception as e:
+            logger.debug(f"Flux de statistiques interrompu pour {instance.name}: {e}")
+        finally:
+            instance.stats_process = None
+    
+    async def upload_files_to_instance(self, instance: CloudShellInstance) -> bool:
         """Upload les fichiers nécessaires vers l'instance"""
         try:
             files_to_upload = [
-                self.config.binary_name,
-                self.config.puzzle_file,
+                file_path for file_path in (self.config.binary_name, self.config.puzzle_file)
+                if os.path.exists(file_path)
             ]
             
-            for file_path in files_to_upload:
-                if os.path.exists(file_path):
-                    cmd = [
-                        "gcloud", "cloud-shell", "scp",
-                        file_path,
-                        f"cloudshell:~/{file_path}",
-                        "--project", instance.project_id
-                    ]
-                    
-                    result = subprocess.run(cmd, capture_output=True, text=True)
-                    if result.returncode != 0:
-                        logger.error(f"Erreur upload {file_path} vers {instance.name}")
-                        return False
+            # Transferts simultanés sur la connexion SSH déjà ouverte
+            results = await asyncio.gather(
+                *(asyncssh.scp(file_path, (instance.ssh_client, file_path), preserve=True)
+                  for file_path in files_to_upload),
+                return_exceptions=True
+            )
+            
+            for file_path, result in zip(files_to_upload, results):
+                if isinstance(result, Exception):
+                    logger.error(f"Erreur upload {file_path} vers {instance.name}: {result}")
+                    return False
             
             logger.info(f"Fichiers uploadés vers {instance.name}")
             return True
@@ -212,9 +466,7 @@ class CloudShellCoordinator:
     
     def create_config_for_instance(self, instance: CloudShellInstance) -> str:
         """Crée un fichier de configuration personnalisé pour l'instance"""
-        start_range, end_range = self.range_manager.get_range_for_instance(
-            instance.name, len(self.instances)
-        )
+        start_range, end_range = self.range_manager.get_range_for_instance(instance.name)
         
         instance.start_range = start_range
         instance.end_range = end_range
@@ -239,32 +491,25 @@ telegram_chat_id={self.config.telegram_chat_id}
 """
         return config_content
     
-    def start_solver_on_instance(self, instance: CloudShellInstance) -> bool:
+    async def start_solver_on_instance(self, instance: CloudShellInstance) -> bool:
         """Lance le solveur sur une instance"""
         try:
             # Créer le fichier de configuration
             config_content = self.create_config_for_instance(instance)
             
-            # Commandes à exécuter
-            commands = [
-                f"echo '{config_content}' > ~/config.txt",
-                f"chmod +x ~/{self.config.binary_name}",
-                f"nohup ~/{self.config.binary_name} > ~/solver.log 2>&1 & echo $! > ~/solver.pid"
-            ]
+            # Script unique : config reçue sur stdin, permissions, lancement
+            script = (
+                f"cat > ~/config.txt && "
+                f"chmod +x ~/{self.config.binary_name} && "
+                f"{{ nohup ~/{self.config.binary_name} < /dev/null > ~/solver.log 2>&1 & echo $! > ~/solver.pid; }}"
+            )
             
-            for cmd_text in commands:
-                cmd = [
-                    "gcloud", "cloud-shell", "ssh",
-                    "--project", instance.project_id,
-                    "--command", cmd_text
-                ]
-                
-                result = subprocess.run(cmd, capture_output=True, text=True)
-                if result.returncode != 0:
-                    logger.error(f"Erreur commande sur {instance.name}: {result.stderr}")
-                    return False
+            result = await instance.ssh_client.run(script, input=config_content)
+            if result.exit_status != 0:
+                logger.error(f"Erreur commande sur {instance.name}: {result.stderr}")
+                return False
             
-            instance.status = "running"
+            self.set_instance_status(instance, "running")
             logger.info(f"Solveur démarré sur {instance.name} (plage: {instance.start_range} - {instance.end_range})")
             return True
             
@@ -272,70 +517,55 @@ telegram_chat_id={self.config.telegram_chat_id}
             logger.error(f"Erreur démarrage solveur sur {instance.name}: {e}")
             return False
     
-    def check_instance_status(self, instance: CloudShellInstance):
+    async def check_instance_status(self, instance: CloudShellInstance):
         """Vérifie le statut d'une instance"""
         try:
-            # Vérifier si le processus est toujours actif
-            cmd = [
-                "gcloud", "cloud-shell", "ssh",
-                "--project", instance.project_id,
-                "--command", "ps aux | grep bitcoin_puzzle_solver | grep -v grep || echo 'NOT_RUNNING'"
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=15)
+            # Les statistiques arrivent par le flux persistant, seul le processus est vérifié ici
+            result = await instance.ssh_client.run(
+                "kill -0 $(cat ~/solver.pid 2>/dev/null) 2>/dev/null || echo 'NOT_RUNNING'",
+                timeout=15
+            )
             
             if "NOT_RUNNING" in result.stdout:
-                instance.status = "stopped"
+                self.set_instance_status(instance, "stopped")
             else:
-                instance.status = "running"
-                
-                # Récupérer les statistiques du log
-                log_cmd = [
-                    "gcloud", "cloud-shell", "ssh",
-                    "--project", instance.project_id,
-                    "--command", "tail -n 5 ~/solver.log | grep Stats"
-                ]
-                
-                log_result = subprocess.run(log_cmd, capture_output=True, text=True)
-                if log_result.stdout:
-                    # Parser les statistiques
-                    self.parse_statistics(instance, log_result.stdout)
+                self.set_instance_status(instance, "running")
+                # Relancer le flux s'il s'est terminé
+                await self.start_stats_stream(instance)
             
             instance.last_update = datetime.now()
             
         except Exception as e:
             logger.error(f"Erreur vérification statut {instance.name}: {e}")
-            instance.status = "error"
-            instance.errors.append(f"Status check error: {str(e)}")
+            self.set_instance_status(instance, "error")
+            self.record_error(instance, f"Status check error: {str(e)}")
     
     def parse_statistics(self, instance: CloudShellInstance, log_output: str):
         """Parse les statistiques depuis le log"""
+        previous_speed = instance.keys_per_second
+        previous_keys = instance.total_keys_checked
         try:
-            for line in log_output.split('\n'):
-                if 'Total:' in line and 'Vitesse:' in line:
-                    parts = line.split('|')
-                    for part in parts:
-                        if 'Total:' in part:
-                            total_str = part.split('Total:')[1].strip().split()[0]
-                            instance.total_keys_checked = int(total_str)
-                        elif 'Vitesse:' in part:
-                            speed_str = part.split('Vitesse:')[1].strip().split()[0]
-                            instance.keys_per_second = float(speed_str)
-                    break
+            match = STATS_RE.search(log_output)
+            if match:
+                instance.total_keys_checked = int(match[1])
+                instance.keys_per_second = float(match[2])
         except Exception as e:
             logger.debug(f"Erreur parsing stats pour {instance.name}: {e}")
+        
+        if instance.status == "running":
+            self._agg["speed"] += instance.keys_per_second - previous_speed
+            self._agg["keys"] += instance.total_keys_checked - previous_keys
     
     def display_status(self):
         """Affiche le statut de toutes les instances"""
-        os.system('clear')
+        if sys.stdout.isatty():
+            # Effacer l'écran par séquence ANSI plutôt qu'en lançant `clear`
+            sys.stdout.write("\x1b[2J\x1b[H")
+            sys.stdout.flush()
         print("=" * 80)
         print(f"🚀 COORDINATEUR BITCOIN PUZZLE SOLVER - {datetime.now().strftime('%H:%M:%S')}")
         print("=" * 80)
         
-        total_speed = 0
-        total_keys = 0
-        active_instances = 0
-        
         for name, instance in self.instances.items():
             status_icon = {
                 "running": "🟢",
@@ -349,59 +579,48 @@ telegram_chat_id={self.config.telegram_chat_id}
                   f"{instance.keys_per_second:>8.0f} k/s | "
                   f"{instance.total_keys_checked:>12,} keys | "
                   f"{instance.start_range[:10]}...{instance.end_range[-6:]}")
-            
-            if instance.status == "running":
-                total_speed += instance.keys_per_second
-                total_keys += instance.total_keys_checked
-                active_instances += 1
         
         print("-" * 80)
-        print(f"📊 TOTAL: {active_instances} instances actives | "
-              f"{total_speed:.0f} k/s | {total_keys:,} keys vérifiées")
+        print(f"📊 TOTAL: {self._agg['active']} instances actives | "
+              f"{self._agg['speed']:.0f} k/s | {self._agg['keys']:,} keys vérifiées")
         print("=" * 80)
         
-        # Afficher les erreurs récentes
-        recent_errors = []
-        for instance in self.instances.values():
-            if instance.errors:
-                recent_errors.extend(instance.errors[-2:])  # 2 dernières erreurs
-        
-        if recent_errors:
+        # Afficher les erreurs récentes (5 dernières max)
+        if self._errors_ring:
             print("🚨 ERREURS RÉCENTES:")
-            for error in recent_errors[-5:]:  # 5 dernières erreurs max
+            for error in self._errors_ring:
                 print(f"   {error}")
             print("-" * 80)
     
-    def health_check_loop(self):
+    async def health_check_loop(self):
         """Boucle de vérification de santé des instances"""
         while self.running:
             try:
-                futures = []
-                for instance in self.instances.values():
-                    if instance.status != "inactive":
-                        future = self.executor.submit(self.check_instance_status, instance)
-                        futures.append(future)
+                checks = [
+                    asyncio.wait_for(self.check_instance_status(instance), timeout=30)
+                    for instance in self.instances.values()
+                    if instance.status != "inactive" and instance.ssh_client is not None
+                ]
                 
-                # Attendre que tous les checks se terminent
-                for future in futures:
-                    try:
-                        future.result(timeout=30)
-                    except Exception as e:
-                        logger.error(f"Erreur health check: {e}")
+                # Tous les checks partent en même temps, sans limite de parallélisme
+                results = await asyncio.gather(*checks, return_exceptions=True)
+                for result in results:
+                    if isinstance(result, Exception):
+                        logger.error(f"Erreur health check: {result!r}")
                 
-                time.sleep(self.config.health_check_interval)
+                await asyncio.sleep(self.config.health_check_interval)
                 
             except Exception as e:
                 logger.error(f"Erreur boucle health check: {e}")
-                time.sleep(10)
+                await asyncio.sleep(10)
     
-    def restart_failed_instances(self):
+    async def restart_failed_instances(self):
         """Redémarre les instances qui ont échoué"""
         for instance in self.instances.values():
             if instance.status in ["stopped", "error"]:
                 logger.info(f"Tentative de redémarrage de {instance.name}")
-                if self.connect_to_instance(instance):
-                    self.start_solver_on_instance(instance)
+                if await self.connect_to_instance(instance):
+                    await self.start_solver_on_instance(instance)
     
     def auto_scale_instances(self):
         """Ajoute automatiquement des instances si possible"""
@@ -410,64 +629,92 @@ telegram_chat_id={self.config.telegram_chat_id}
             # (nécessite une liste de projets disponibles)
             pass
     
-    def start_coordination(self):
+    async def _bringup(self, instance: CloudShellInstance) -> bool:
+        """Connecte, prépare et démarre une instance"""
+        logger.info(f"Initialisation de {instance.name}...")
+        if await self.connect_to_instance(instance):
+            if await self.upload_files_to_instance(instance):
+                return await self.start_solver_on_instance(instance)
+        return False
+    
+    async def start_coordination(self):
         """Démarre la coordination"""
         self.running = True
         
-        # Démarrer la boucle de health check dans un thread séparé
-        health_thread = threading.Thread(target=self.health_check_loop)
-        health_thread.daemon = True
-        health_thread.start()
+        # Démarrer la boucle de health check en tâche de fond
+        health_task = asyncio.create_task(self.health_check_loop())
         
         # Connecter et démarrer toutes les instances
         logger.info("Démarrage de la coordination...")
         
-        for instance in self.instances.values():
-            logger.info(f"Initialisation de {instance.name}...")
-            if self.connect_to_instance(instance):
-                if self.upload_files_to_instance(instance):
-                    self.start_solver_on_instance(instance)
-        
-        # Boucle principale d'affichage
         try:
+            await asyncio.gather(*(self._bringup(instance) for instance in self.instances.values()))
+            
+            # Échéances des tâches périodiques
+            self._next_restart_at = time.monotonic() + 60
+            self._next_rebalance_at = time.monotonic() + self.config.rebalance_interval
+            
+            # Boucle principale d'affichage
             while self.running:
+                self.process_status_updates()
                 self.display_status()
-                time.sleep(5)
+                await asyncio.sleep(5)
                 
                 # Redémarrer les instances échouées périodiquement
-                if int(time.time()) % 60 == 0:
-                    self.restart_failed_instances()
+                # L'échéance suivante part de la fin du redémarrage, qui peut être long
+                if time.monotonic() >= self._next_restart_at:
+                    await self.restart_failed_instances()
+                    self._next_restart_at = time.monotonic() + 60
+                
+                if time.monotonic() >= self._next_rebalance_at:
+                    self.auto_scale_instances()
+                    self._next_rebalance_at = time.monotonic() + self.config.rebalance_interval
                     
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            print("\n👋 Arrêt en cours...")
             logger.info("Arrêt demandé par l'utilisateur")
-            self.stop_coordination()
+            await self.stop_coordination()
+            raise
+        finally:
+            health_task.cancel()
     
-    def stop_coordination(self):
+    async def _stop_instance(self, instance: CloudShellInstance):
+        """Arrête le solveur d'une instance et ferme sa connexion"""
+        if instance.status == "running":
+            try:
+                await instance.ssh_client.run("pkill -f bitcoin_puzzle_solver", timeout=10)
+                logger.info(f"Solveur arrêté sur {instance.name}")
+            except Exception as e:
+                logger.error(f"Erreur arrêt {instance.name}: {e}")
+        
+        if instance.stats_task is not None:
+            instance.stats_task.cancel()
+        
+        instance.ssh_client.close()
+        await instance.ssh_client.wait_closed()
+        instance.ssh_client = None
+    
+    async def stop_coordination(self):
         """Arrête la coordination"""
         self.running = False
         logger.info("Arrêt de la coordination...")
         
-        # Arrêter tous les solveurs
-        for instance in self.instances.values():
-            if instance.status == "running":
-                try:
-                    cmd = [
-                        "gcloud", "cloud-shell", "ssh",
-                        "--project", instance.project_id,
-                        "--command", "pkill -f bitcoin_puzzle_solver"
-                    ]
-                    subprocess.run(cmd, timeout=10)
-                    logger.info(f"Solveur arrêté sur {instance.name}")
-                except Exception as e:
-                    logger.error(f"Erreur arrêt {instance.name}: {e}")
-        
-        self.executor.shutdown(wait=True)
+        # Arrêter tous les solveurs en parallèle
+        connected = [instance for instance in self.instances.values() if instance.ssh_client is not None]
+        results = await asyncio.gather(
+            *(self._stop_instance(instance) for instance in connected),
+            return_exceptions=True
+        )
+        for instance, result in zip(connected, results):
+            if isinstance(result, Exception):
+                logger.error(f"Erreur fermeture {instance.name}: {result}")
 
 def load_instances_from_file(filename: str) -> List[Dict]:
     """Charge la liste des instances depuis un fichier JSON"""
     try:
-        with open(filename, 'r') as f:
-            return json.load(f)
+        with open(filename, 'rb') as f:
+            data = f.read()
+        return orjson.loads(data) if orjson is not None else json.loads(data)
     except FileNotFoundError:
         logger.warning(f"Fichier {filename} non trouvé, création d'un exemple...")
         example_instances = [
@@ -485,14 +732,18 @@ def load_instances_from_file(filename: str) -> List[Dict]:
             }
         ]
         
-        with open(filename, 'w') as f:
-            json.dump(example_instances, f, indent=2)
+        if orjson is not None:
+            with open(filename, 'wb') as f:
+                f.write(orjson.dumps(example_instances, option=orjson.OPT_INDENT_2))
+        else:
+            with open(filename, 'w') as f:
+                json.dump(example_instances, f, indent=2)
         
         print(f"Fichier d'exemple créé: {filename}")
         print("Modifiez ce fichier avec vos vrais projets Google Cloud, puis relancez.")
         return []
 
-def main():
+async def main_async():
     """Fonction principale"""
     
     # Configuration
@@ -522,11 +773,15 @@ def main():
     print("Appuyez sur Ctrl+C pour arrêter proprement\n")
     
     # Démarrer la coordination
+    await coordinator.start_coordination()
+
+def main():
+    """Point d'entrée synchrone"""
     try:
-        coordinator.start_coordination()
+        asyncio.run(main_async())
     except KeyboardInterrupt:
-        print("\n👋 Arrêt en cours...")
-        coordinator.stop_coordination()
+        # Ctrl+C : l'arrêt des instances est déjà fait dans start_coordination
+        pass
 
 if __name__ == "__main__":
     main()
\ No newline at end of file